@@ -5,7 +5,7 @@ import json
 import re
 from datetime import datetime
 import logging
-from utils import expand_contractions, convert_words_to_dict, convert_utterances_to_dict
+from utils import expand_contractions, convert_words_to_dict, convert_utterances_to_dict, transcript_log_filename
 load_dotenv()
 aai.settings.api_key = os.getenv("ASSEMBLY_API_KEY")
 
@@ -23,8 +23,7 @@ def transcribe_audio(audio_file):
   if transcript.status == "error":
       raise RuntimeError(f"Transcription failed: {transcript.error}")
 
-  timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-  log_filename = f"../logs/transcript_{timestamp}.json"
+  log_filename = transcript_log_filename(audio_file)
 
 
   original_text = getattr(transcript, 'text', None)
@@ -7,7 +7,7 @@ import re
 import json
 import logging
 from datetime import datetime
-from utils import expand_contractions, convert_words_to_dict, convert_utterances_to_dict
+from utils import expand_contractions, convert_words_to_dict, convert_utterances_to_dict, transcript_log_filename
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -69,7 +69,7 @@ def transcribe_audio(audio_file):
     # final_text = remove_apostrophes(expanded_text)
     
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_filename = f"../logs/transcript_{timestamp}.json"
+    log_filename = transcript_log_filename(audio_file)
     
     transcript_dict = {
         "service": "eleven_labs",
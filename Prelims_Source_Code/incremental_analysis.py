@@ -0,0 +1,213 @@
+"""
+Incremental per-session candidate analysis.
+
+Instead of waiting for all five sessions and re-sending every transcript, each
+new `<shadow_id>_<year>_<n>` session is analysed together with a compact saved
+state for that candidate and year: the current revealed_truth estimate, a
+bounded claim ledger and the deception patterns found so far. The prompt size
+depends only on the state caps and the new session, so the token cost per
+update does not grow with the number of sessions. A result is available after
+every session.
+"""
+import glob
+import json
+import os
+import re
+import threading
+
+import openai
+from prompt import incremental_prompt
+from stream_writers import JSONLWriter, JSONArrayWriter
+
+STATE_DIR = "../candidate_state"
+MAX_LEDGER_CLAIMS = 12
+MAX_DECEPTION_PATTERNS = 6
+
+SESSION_PATTERN = re.compile(r"^(?P<shadow_id>[^_\s]+)_(?P<year>\d{4})_(?P<session>\d+)\.\w+$")
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def parse_session_line(line):
+    """Split a raw.txt line into (shadow_id, year, session_number, transcript)"""
+    filename, _, text = line.strip().partition(': ')
+    match = SESSION_PATTERN.match(filename)
+    if not match:
+        raise ValueError(f"Not a <shadow_id>_<year>_<n> session line: {filename}")
+    return match.group("shadow_id"), match.group("year"), int(match.group("session")), text
+
+
+def candidate_key(shadow_id, year):
+    """State key: the same shadow_id in different years is a different interview series"""
+    return f"{shadow_id}_{year}"
+
+
+def empty_state(shadow_id, year):
+    return {
+        "shadow_id": shadow_id,
+        "year": year,
+        "sessions_seen": [],
+        "revealed_truth": {},
+        "claim_ledger": [],
+        "deception_patterns": [],
+    }
+
+
+def state_path(shadow_id, year, state_dir=STATE_DIR):
+    return os.path.join(state_dir, f"{candidate_key(shadow_id, year)}.json")
+
+
+def load_state(shadow_id, year, state_dir=STATE_DIR):
+    path = state_path(shadow_id, year, state_dir)
+    if not os.path.exists(path):
+        return empty_state(shadow_id, year)
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_all_states(state_dir=STATE_DIR):
+    """Every saved candidate state, in file name order"""
+    states = []
+    for path in sorted(glob.glob(os.path.join(state_dir, "*.json"))):
+        with open(path, 'r', encoding='utf-8') as f:
+            states.append(json.load(f))
+    return states
+
+
+def save_state(state, state_dir=STATE_DIR):
+    """Write the candidate state atomically so a crash never leaves a partial file"""
+    os.makedirs(state_dir, exist_ok=True)
+    path = state_path(state["shadow_id"], state["year"], state_dir)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def result_from_state(state):
+    """Shape a candidate state like one PrelimsSubmission.json entry"""
+    return {
+        "shadow_id": state["shadow_id"],
+        "revealed_truth": state["revealed_truth"],
+        "deception_patterns": state["deception_patterns"],
+    }
+
+
+def validate_update(update):
+    """Raise ValueError unless the model output is an object whose state fields have the right types"""
+    if not isinstance(update, dict):
+        raise ValueError(f"Expected a JSON object from the model, got {type(update).__name__}")
+    for field, expected in (("revealed_truth", dict), ("claim_ledger", list), ("deception_patterns", list)):
+        if field in update and not isinstance(update[field], expected):
+            raise ValueError(f"Model returned {field} as {type(update[field]).__name__}, expected {expected.__name__}")
+
+
+def _candidate_lock(key):
+    with _locks_guard:
+        return _locks.setdefault(key, threading.Lock())
+
+
+def update_candidate(line, client=None, state_dir=STATE_DIR):
+    """
+    Fold one new session line into its candidate's saved state. Returns
+    (submission entry, applied); applied is False when the session was already
+    in the state, in which case nothing is sent to the model.
+    """
+    shadow_id, year, session_number, session_text = parse_session_line(line)
+
+    with _candidate_lock(candidate_key(shadow_id, year)):
+        state = load_state(shadow_id, year, state_dir)
+        if session_number in state["sessions_seen"]:
+            return result_from_state(state), False
+
+        if client is None:
+            client = openai.OpenAI()
+
+        state_text = json.dumps({
+            "revealed_truth": state["revealed_truth"],
+            "claim_ledger": state["claim_ledger"],
+            "deception_patterns": state["deception_patterns"],
+        }, ensure_ascii=False)
+
+        response = client.chat.completions.create(
+            model="gpt-4",
+            messages=[
+                {"role": "system", "content": "You are Truth Weaver, an expert interview analysis agent. Return only valid JSON as specified."},
+                {"role": "user", "content": incremental_prompt.format(
+                    max_claims=MAX_LEDGER_CLAIMS,
+                    max_patterns=MAX_DECEPTION_PATTERNS,
+                    candidate_name=shadow_id,
+                    state_text=state_text,
+                    session_number=session_number,
+                    session_text=session_text,
+                )}
+            ],
+            temperature=0.1
+        )
+
+        update = json.loads(response.choices[0].message.content.strip())
+        validate_update(update)
+
+        # Enforce the caps even if the model ignores them so the next prompt stays flat.
+        # Both lists are kept oldest first, so trimming from the front keeps the newest entries.
+        state["revealed_truth"] = update.get("revealed_truth", state["revealed_truth"])
+        state["claim_ledger"] = update.get("claim_ledger", state["claim_ledger"])[-MAX_LEDGER_CLAIMS:]
+        state["deception_patterns"] = update.get("deception_patterns", state["deception_patterns"])[-MAX_DECEPTION_PATTERNS:]
+        state["sessions_seen"] = sorted(state["sessions_seen"] + [session_number])
+        save_state(state, state_dir)
+
+    return result_from_state(state), True
+
+
+def incremental_analysis(input_file, output_file="../PrelimsSubmission.incremental.json",
+                         updates_file="../PrelimsSubmission.updates.jsonl", state_dir=STATE_DIR):
+    """
+    Apply every new session in input_file, appending each update to
+    updates_file, then write the latest result for every candidate saved under
+    state_dir, including candidates with no session in this input. Both files
+    are kept apart from the batch analysis outputs, which have a different
+    record shape and are rewritten on every run.
+    """
+    client = openai.OpenAI()
+
+    with open(input_file, 'r', encoding='utf-8') as f, JSONLWriter(updates_file, mode='a') as jsonl_writer:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                shadow_id, year, session_number, session_text = parse_session_line(line)
+            except ValueError as e:
+                print(f"✗ Skipping line: {e}")
+                continue
+            if session_text.startswith("[ERROR"):
+                print(f"✗ Skipping failed transcription for {shadow_id} session {session_number}")
+                continue
+
+            try:
+                result, applied = update_candidate(line, client, state_dir)
+                if not applied:
+                    continue
+                jsonl_writer.write({"session": session_number, **result})
+                print(f"✓ Updated {shadow_id} with session {session_number}")
+            except json.JSONDecodeError as e:
+                print(f"✗ JSON parsing error for {shadow_id} session {session_number}: {e}")
+            except ValueError as e:
+                print(f"✗ Invalid update for {shadow_id} session {session_number}: {e}")
+            except Exception as e:
+                print(f"✗ API error for {shadow_id} session {session_number}: {e}")
+
+    results = [result_from_state(state) for state in load_all_states(state_dir)]
+    with JSONArrayWriter(output_file) as array_writer:
+        for result in results:
+            array_writer.write(result)
+
+    print(f"\n✓ Incremental analyses saved to {output_file}")
+    print(f"Total candidates analyzed: {array_writer.count}")
+
+    return results
+
+
+if __name__ == "__main__":
+    incremental_analysis("../raw.txt")
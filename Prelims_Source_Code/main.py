@@ -6,106 +6,125 @@ import openai
 import glob
 from prompt import prompt
 import json
+from stream_writers import LineWriter, JSONLWriter, JSONArrayWriter
+
+TRANSCRIBERS = {
+    "assembly_ai": transcribe_audio,
+    "whisper_groq": transcribe_audio_groq,
+    "eleven_labs": transcribe_audio_eleven_labs,
+}
+
+def transcribe_file(audio_file, method):
+    """Transcribe a single audio file and return its formatted raw.txt line"""
+    filename = os.path.basename(audio_file)
+    formatted_filename = filename.replace('.mp3', '.mp4')
+    transcription = TRANSCRIBERS[method](audio_file)
+    return f"{formatted_filename}: {transcription}"
 
 def transcribe_all_audio_files(method):
     """Transcribe all audio files in the Evaluation set/audio directory"""
     audio_dir = "../Evaluation set/audio"
     output_file = "../raw.txt"
-    
+
     audio_files = glob.glob(os.path.join(audio_dir, "*.mp3"))
-    audio_files.sort()  
-    transcriptions = []
-    
+    audio_files.sort()
+
     print(f"Found {len(audio_files)} audio files to transcribe...")
-    
-    for audio_file in audio_files:
-        filename = os.path.basename(audio_file)
-        print(f"Transcribing {filename}...")
-        
-        try:
-            if method == "assembly_ai":
-                transcription = transcribe_audio(audio_file)
-            elif method == "whisper_groq":
-                transcription = transcribe_audio_groq(audio_file)
-            elif method == "eleven_labs":
-                transcription = transcribe_audio_eleven_labs(audio_file)
-            formatted_filename = filename.replace('.mp3', '.mp4')
-            formatted_line = f"{formatted_filename}: {transcription}"
-            transcriptions.append(formatted_line)
-            
-            print(f"✓ Successfully transcribed {filename}")
-            
-        except Exception as e:
-            print(f"✗ Error transcribing {filename}: {str(e)}")
-            formatted_filename = filename.replace('.mp3', '.mp4')
-            formatted_line = f"{formatted_filename}: [ERROR: {str(e)}]"
-            transcriptions.append(formatted_line)
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        for line in transcriptions:
-            f.write(line + '\n')
-    
+
+    # Stream to raw.txt.tmp so a failed or interrupted run keeps the previous raw.txt
+    with LineWriter(output_file, atomic=True) as writer:
+        for audio_file in audio_files:
+            filename = os.path.basename(audio_file)
+            print(f"Transcribing {filename}...")
+
+            try:
+                formatted_line = transcribe_file(audio_file, method)
+                writer.write(formatted_line)
+
+                print(f"✓ Successfully transcribed {filename}")
+
+            except Exception as e:
+                print(f"✗ Error transcribing {filename}: {str(e)}")
+                formatted_filename = filename.replace('.mp3', '.mp4')
+                formatted_line = f"{formatted_filename}: [ERROR: {str(e)}]"
+                writer.write(formatted_line)
+
     print(f"\nAll transcriptions saved to {output_file}")
     print(f"Total files processed: {len(audio_files)}")
-    
-def analysis(input_file):
-    """Analyze transcriptions in batches of 5 and generate JSON output"""
+
+def analyze_candidate(batch, client=None):
+    """
+    Analyze one candidate's session lines and return the parsed JSON result.
+    Raises json.JSONDecodeError if the model does not return valid JSON.
+    """
+    if client is None:
+        client = openai.OpenAI()
+
+    first_line = batch[0]
+    candidate_name = first_line.split('_')[0]
+
+    sessions_text = "\n".join([f"• Session {i+1}: \"{line.split(': ', 1)[1]}\"" for i, line in enumerate(batch)])
+
+    response = client.chat.completions.create(
+        model="gpt-4",
+        messages=[
+            {"role": "system", "content": "You are Truth Weaver, an expert interview analysis agent. Return only valid JSON as specified."},
+            {"role": "user", "content": prompt.format(candidate_name=candidate_name, sessions_text=sessions_text)}
+        ],
+        temperature=0.1
+    )
+
+    response_text = response.choices[0].message.content.strip()
+    return json.loads(response_text)
+
+def iter_batches(input_file, size=5):
+    """Yield complete batches of `size` non-empty lines without loading the whole file"""
+    batch = []
     with open(input_file, 'r', encoding='utf-8') as f:
-        lines = [line.strip() for line in f.readlines() if line.strip()]
-    
-    batches = []
-    for i in range(0, len(lines), 5):
-        batch = lines[i:i+5]
-        if len(batch) == 5:  
-            batches.append(batch)
-    
-    print(f"Found {len(batches)} complete batches of 5 sessions each")
-    
-    all_results = []
-    
-    for batch_idx, batch in enumerate(batches):
-        print(f"Processing batch {batch_idx + 1}/{len(batches)}...")
-        
-        first_line = batch[0]
-        candidate_name = first_line.split('_')[0]  
-        
-        sessions_text = "\n".join([f"• Session {i+1}: \"{line.split(': ', 1)[1]}\"" for i, line in enumerate(batch)])
-        
-
-        
-        try:
-            client = openai.OpenAI()
-            response = client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are Truth Weaver, an expert interview analysis agent. Return only valid JSON as specified."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1
-            )
-            
-            response_text = response.choices[0].message.content.strip()
-            
+        for line in f:
+            if not line.strip():
+                continue
+            batch.append(line.strip())
+            if len(batch) == size:
+                yield batch
+                batch = []
+
+def analysis(input_file, output_file="../PrelimsSubmission.json"):
+    """
+    Analyze transcriptions in batches of 5, streaming each result to
+    PrelimsSubmission.jsonl and the atomically finalized JSON array.
+    Returns the number of candidates analyzed.
+    """
+    with open(input_file, 'r', encoding='utf-8') as f:
+        total_batches = sum(1 for line in f if line.strip()) // 5
+
+    print(f"Found {total_batches} complete batches of 5 sessions each")
+
+    client = openai.OpenAI()
+    jsonl_file = os.path.splitext(output_file)[0] + ".jsonl"
+
+    with JSONArrayWriter(output_file) as array_writer, JSONLWriter(jsonl_file) as jsonl_writer:
+        for batch_idx, batch in enumerate(iter_batches(input_file)):
+            print(f"Processing batch {batch_idx + 1}/{total_batches}...")
+
+            candidate_name = batch[0].split('_')[0]
+
             try:
-                result_json = json.loads(response_text)
-                all_results.append(result_json)
+                result_json = analyze_candidate(batch, client)
+                jsonl_writer.write(result_json)
+                array_writer.write(result_json)
                 print(f"✓ Successfully analyzed {candidate_name}")
             except json.JSONDecodeError as e:
                 print(f"✗ JSON parsing error for {candidate_name}: {e}")
-                print(f"Response was: {response_text[:200]}...")
-                
-        except Exception as e:
-            print(f"✗ API error for {candidate_name}: {e}")
-    
-    output_file = "../PrelimsSubmission.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(all_results, f, indent=2, ensure_ascii=False)
-    
+                print(f"Response was: {e.doc[:200]}...")
+            except Exception as e:
+                print(f"✗ API error for {candidate_name}: {e}")
+
     print(f"\n✓ All analyses saved to {output_file}")
-    print(f"Total candidates analyzed: {len(all_results)}")
-    
-    return all_results
+    print(f"Total candidates analyzed: {array_writer.count}")
+
+    return array_writer.count
 
 if __name__ == "__main__":
     transcribe_all_audio_files(method="eleven_labs")
-    analysis("../raw.txt")
\ No newline at end of file
+    analysis("../raw.txt")
@@ -0,0 +1,278 @@
+"""
+Long-running Truth Weaver worker service.
+
+Importing the provider modules builds their SDK clients, reads .env and loads
+spaCy once at startup, so jobs submitted to the daemon only pay provider
+latency. Jobs run on a fixed pool of worker threads fed by a bounded queue;
+when the queue is full new submissions are rejected with 503 so callers can
+back off.
+
+Endpoints (all JSON, bound to localhost by default):
+  POST /jobs/transcribe   {"audio_file": "...", "method": "eleven_labs"}
+  POST /jobs/analyze      {"sessions": ["atlas_2025_1.mp4: ...", ...]}
+  POST /jobs/update       {"session": "atlas_2025_3.mp4: ..."}  (incremental)
+  GET  /jobs/<id>         current status and result
+  GET  /jobs/<id>/events  newline-delimited JSON progress stream
+  GET  /health            queue depth and worker count
+"""
+import argparse
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import openai
+from main import TRANSCRIBERS, transcribe_file, analyze_candidate
+from incremental_analysis import parse_session_line, update_candidate
+import utils  # noqa: F401 -- warm spaCy model for contraction expansion
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FINISHED = ("completed", "failed")
+
+
+class Job:
+    """A single transcription or analysis request and its progress events"""
+
+    def __init__(self, kind, payload):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.payload = payload
+        self.status = "queued"
+        self.result = None
+        self.error = None
+        self.events = []
+        self._cond = threading.Condition()
+        self.emit("queued")
+
+    def emit(self, event, **data):
+        with self._cond:
+            if event in ("started",) + FINISHED:
+                self.status = event
+            self.events.append({"job_id": self.id, "event": event, "time": time.time(), **data})
+            self._cond.notify_all()
+
+    def finished(self):
+        return self.status in FINISHED
+
+    def iter_events(self, timeout=None):
+        """Yield events as they are emitted until the job finishes"""
+        index = 0
+        while True:
+            with self._cond:
+                while index >= len(self.events) and not self.finished():
+                    if not self._cond.wait(timeout):
+                        return
+                pending = self.events[index:]
+                index = len(self.events)
+                done = self.finished()
+            yield from pending
+            if done and index >= len(self.events):
+                return
+
+    def to_dict(self):
+        with self._cond:
+            return {
+                "job_id": self.id,
+                "kind": self.kind,
+                "status": self.status,
+                "result": self.result,
+                "error": self.error,
+            }
+
+
+class WorkerPool:
+    """Fixed set of worker threads consuming a bounded job queue"""
+
+    def __init__(self, workers=4, queue_size=32, max_jobs=1000):
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.jobs = OrderedDict()
+        self.max_jobs = max_jobs
+        self.client = openai.OpenAI()
+        self._lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, kind, payload):
+        """Queue a job, raising queue.Full when the pool is saturated"""
+        job = Job(kind, payload)
+        self.queue.put_nowait(job)
+        with self._lock:
+            self.jobs[job.id] = job
+            self._evict()
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def _evict(self):
+        # Drop the oldest finished jobs so the job table stays bounded
+        for job_id in list(self.jobs):
+            if len(self.jobs) <= self.max_jobs:
+                break
+            if self.jobs[job_id].finished():
+                del self.jobs[job_id]
+
+    def _worker(self):
+        while True:
+            job = self.queue.get()
+            job.emit("started")
+            try:
+                job.result = self._run(job)
+                job.emit("completed", result=job.result)
+            except Exception as e:
+                logger.exception(f"Job {job.id} failed")
+                job.error = str(e)
+                job.emit("failed", error=job.error)
+            finally:
+                self.queue.task_done()
+
+    def _run(self, job):
+        if job.kind == "transcribe":
+            audio_file = job.payload["audio_file"]
+            job.emit("progress", message=f"Transcribing {os.path.basename(audio_file)}")
+            return transcribe_file(audio_file, job.payload["method"])
+        if job.kind == "analyze":
+            sessions = job.payload["sessions"]
+            job.emit("progress", message=f"Analyzing {sessions[0].split('_')[0]}")
+            return analyze_candidate(sessions, self.client)
+        if job.kind == "update":
+            line = job.payload["session"]
+            job.emit("progress", message=f"Updating {line.split('_')[0]}")
+            result, applied = update_candidate(line, self.client)
+            if not applied:
+                job.emit("progress", message="Session already applied; returning saved state")
+            return result
+        raise ValueError(f"Unknown job kind: {job.kind}")
+
+
+def validate_payload(kind, payload):
+    """Return a normalised payload or raise ValueError describing the problem"""
+    if not isinstance(payload, dict):
+        raise ValueError("Request body must be a JSON object")
+    if kind == "transcribe":
+        audio_file = payload.get("audio_file")
+        method = payload.get("method", "eleven_labs")
+        if not isinstance(audio_file, str) or not os.path.isfile(audio_file):
+            raise ValueError(f"audio_file not found: {audio_file}")
+        if method not in TRANSCRIBERS:
+            raise ValueError(f"method must be one of {sorted(TRANSCRIBERS)}")
+        return {"audio_file": audio_file, "method": method}
+    if kind == "analyze":
+        sessions = payload.get("sessions")
+        if not isinstance(sessions, list) or not sessions:
+            raise ValueError("sessions must be a non-empty list")
+        if not all(isinstance(line, str) and ': ' in line for line in sessions):
+            raise ValueError("each session must be a '<file>: <transcript>' line")
+        return {"sessions": sessions}
+    if kind == "update":
+        line = payload.get("session")
+        if not isinstance(line, str):
+            raise ValueError("session must be a '<shadow_id>_<year>_<n>.mp4: <transcript>' line")
+        parse_session_line(line)
+        return {"session": line}
+    raise ValueError(f"Unknown job kind: {kind}")
+
+
+class JobHandler(BaseHTTPRequestHandler):
+    pool = None
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        parts = self.path.strip('/').split('/')
+        if len(parts) != 2 or parts[0] != "jobs":
+            return self._send_json(404, {"error": "not found"})
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = validate_payload(parts[1], json.loads(self.rfile.read(length) or b"{}"))
+        except (ValueError, json.JSONDecodeError) as e:
+            return self._send_json(400, {"error": str(e)})
+
+        try:
+            job = self.pool.submit(parts[1], payload)
+        except queue.Full:
+            return self._send_json(503, {"error": "job queue is full"}, {"Retry-After": "1"})
+
+        self._send_json(202, {
+            "job_id": job.id,
+            "status": job.status,
+            "events_url": f"/jobs/{job.id}/events",
+        })
+
+    def do_GET(self):
+        parts = self.path.strip('/').split('/')
+        if parts == ["health"]:
+            return self._send_json(200, {
+                "status": "ok",
+                "queued": self.pool.queue.qsize(),
+                "workers": len(self.pool._threads),
+            })
+        if len(parts) < 2 or parts[0] != "jobs":
+            return self._send_json(404, {"error": "not found"})
+
+        job = self.pool.get(parts[1])
+        if job is None:
+            return self._send_json(404, {"error": f"unknown job {parts[1]}"})
+        if len(parts) == 2:
+            return self._send_json(200, job.to_dict())
+        if len(parts) == 3 and parts[2] == "events":
+            return self._stream_events(job)
+        self._send_json(404, {"error": "not found"})
+
+    def _stream_events(self, job):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        try:
+            for event in job.iter_events():
+                self.wfile.write((json.dumps(event, ensure_ascii=False) + '\n').encode('utf-8'))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            logger.info(f"Client stopped following job {job.id}")
+
+    def log_message(self, format, *args):
+        logger.info("%s - %s", self.address_string(), format % args)
+
+
+def serve(host="127.0.0.1", port=8765, workers=4, queue_size=32):
+    JobHandler.pool = WorkerPool(workers=workers, queue_size=queue_size)
+    server = ThreadingHTTPServer((host, port), JobHandler)
+    server.daemon_threads = True
+    logger.info(f"Truth Weaver worker service listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the Truth Weaver worker service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--queue-size", type=int, default=32)
+    args = parser.parse_args()
+    serve(args.host, args.port, args.workers, args.queue_size)
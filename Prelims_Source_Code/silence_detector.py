@@ -0,0 +1,484 @@
+"""
+Real-time silence and turn detection for live interview audio.
+
+Each session has its own PCM ring buffer, frame clock and noise-floor
+calibration, so interviews can join, leave and deliver samples on separate
+streams with their own jitter. Buffered audio is analysed in fixed 20 ms
+frames: every call to process() takes one frame from each session that has
+a full frame ready and decides voice activity for all of them at once with
+NumPy, from frame energy (dBFS against an adaptive noise floor) and
+zero-crossing rate, so a single core can follow many interviews.
+
+The noise floor is seeded from the quietest frame of a session's first
+200 ms (capped at min_energy_db + energy_margin_db). It follows unvoiced
+frames quickly, so steady background noise such as mic hiss stops counting
+as speech. During voiced frames it only creeps up while the frame is more
+than two margins above it, so sustained speech is never absorbed as noise.
+Known limitation: loud noise that switches on mid-session is taken for a
+short turn before the floor catches up, and a steady low-ZCR hum cannot be
+told apart from a sustained vowel.
+
+Events are plain dicts carrying the session id and the time in ms since that
+session joined, emitted as soon as the frame that triggers them is analysed:
+  turn_start         candidate started speaking
+  turn_end           candidate stopped speaking for turn_end_ms
+  brief_pause        silence reached 1 s   -> allow natural processing time
+  extended_silence   silence reached 5 s   -> gentle nudge
+  prolonged_silence  silence reached 15 s  -> strategic hint
+"""
+import argparse
+import logging
+import time
+
+import numpy as np
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SILENCE_LEVELS = (
+    ("brief_pause", 1000),
+    ("extended_silence", 5000),
+    ("prolonged_silence", 15000),
+)
+
+
+class PCMRingBuffer:
+    """Fixed-capacity sample buffers, one row per session slot, each with its own read position"""
+
+    def __init__(self, n_slots, capacity):
+        self.data = np.zeros((n_slots, capacity), dtype=np.float32)
+        self.capacity = capacity
+        self.start = np.zeros(n_slots, dtype=np.int64)
+        self.size = np.zeros(n_slots, dtype=np.int64)
+
+    def grow(self, n_slots):
+        extra = n_slots - self.data.shape[0]
+        if extra > 0:
+            self.data = np.vstack((self.data, np.zeros((extra, self.capacity), dtype=np.float32)))
+            self.start = np.concatenate((self.start, np.zeros(extra, dtype=np.int64)))
+            self.size = np.concatenate((self.size, np.zeros(extra, dtype=np.int64)))
+
+    def clear(self, slot):
+        self.start[slot] = 0
+        self.size[slot] = 0
+
+    def free(self, slot):
+        return self.capacity - int(self.size[slot])
+
+    def write(self, slot, samples):
+        k = len(samples)
+        if k > self.free(slot):
+            raise OverflowError(f"Ring buffer slot {slot} has room for {self.free(slot)} samples, got {k}")
+        end = int(self.start[slot] + self.size[slot]) % self.capacity
+        first = min(k, self.capacity - end)
+        self.data[slot, end:end + first] = samples[:first]
+        if first < k:
+            self.data[slot, :k - first] = samples[first:]
+        self.size[slot] += k
+
+    def read(self, slots, k):
+        """Read k samples from each slot in `slots`, returned shaped (len(slots), k)"""
+        if np.any(self.size[slots] < k):
+            raise ValueError(f"Not every slot holds {k} samples")
+        index = (self.start[slots, np.newaxis] + np.arange(k)) % self.capacity
+        out = self.data[slots[:, np.newaxis], index]
+        self.start[slots] = (self.start[slots] + k) % self.capacity
+        self.size[slots] -= k
+        return out
+
+
+def frame_features(frames):
+    """
+    Return (energy_db, zcr) for frames shaped (..., frame_len).
+    energy_db is mean power in dBFS, zcr the fraction of adjacent samples changing sign.
+    """
+    energy_db = 10.0 * np.log10(np.einsum('...i,...i->...', frames, frames) / frames.shape[-1] + 1e-10)
+    signs = np.signbit(frames)
+    zcr = np.count_nonzero(signs[..., 1:] != signs[..., :-1], axis=-1) / (frames.shape[-1] - 1)
+    return energy_db, zcr
+
+
+class SilenceDetector:
+    """Streaming energy/zero-crossing VAD with silence and turn events for independent live sessions"""
+
+    def __init__(self, sample_rate=16000, frame_ms=20, min_speech_ms=60, turn_end_ms=700,
+                 energy_margin_db=10.0, min_energy_db=-50.0, max_zcr=0.35, noise_adapt=0.05,
+                 noise_rise=0.005, calibration_ms=200, buffer_ms=500, session_ids=()):
+        self.frame_ms = frame_ms
+        self.frame_len = sample_rate * frame_ms // 1000
+        self.min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self.turn_end_frames = max(1, turn_end_ms // frame_ms)
+        self.energy_margin_db = energy_margin_db
+        self.min_energy_db = min_energy_db
+        self.max_zcr = max_zcr
+        self.noise_adapt = noise_adapt
+        self.noise_rise = noise_rise
+        self.calibration_frames = max(1, calibration_ms // frame_ms)
+
+        capacity = max(self.frame_len, sample_rate * buffer_ms // 1000 // self.frame_len * self.frame_len)
+        self.ring = PCMRingBuffer(0, capacity)
+
+        # Per-slot state; a removed session's slot is reused by the next one to join
+        self.slots = {}
+        self.slot_ids = []
+        self._free_slots = []
+        self.active = np.zeros(0, dtype=bool)
+        self.frames_seen = np.zeros(0, dtype=np.int64)
+        self.calibration_seen = np.zeros(0, dtype=np.int64)
+        self.noise_floor = np.zeros(0)
+        self.in_speech = np.zeros(0, dtype=bool)
+        self.speech_run = np.zeros(0, dtype=np.int64)
+        self.silence_frames = np.zeros(0, dtype=np.int64)
+        self.silence_level = np.zeros(0, dtype=np.int64)
+
+        for session_id in session_ids:
+            self.add_session(session_id)
+
+    def _grow(self, n_slots):
+        extra = n_slots - len(self.slot_ids)
+        self.ring.grow(n_slots)
+        self.slot_ids.extend([None] * extra)
+        self.active = np.concatenate((self.active, np.zeros(extra, dtype=bool)))
+        for name in ("frames_seen", "calibration_seen", "speech_run", "silence_frames", "silence_level"):
+            setattr(self, name, np.concatenate((getattr(self, name), np.zeros(extra, dtype=np.int64))))
+        self.noise_floor = np.concatenate((self.noise_floor, np.zeros(extra)))
+        self.in_speech = np.concatenate((self.in_speech, np.zeros(extra, dtype=bool)))
+        self._free_slots.extend(range(n_slots - 1, n_slots - extra - 1, -1))
+
+    def add_session(self, session_id):
+        """Start tracking a session; its clock and noise calibration start from its first sample"""
+        if session_id in self.slots:
+            raise ValueError(f"Session {session_id!r} is already being tracked")
+        if not self._free_slots:
+            self._grow(max(16, 2 * len(self.slot_ids)))
+        slot = self._free_slots.pop()
+        self.slots[session_id] = slot
+        self.slot_ids[slot] = session_id
+        self.active[slot] = True
+        self.ring.clear(slot)
+        self.frames_seen[slot] = 0
+        self.reset(session_id)
+
+    def remove_session(self, session_id):
+        """Stop tracking a session, dropping any audio it still has buffered"""
+        slot = self.slots.pop(session_id)
+        self.slot_ids[slot] = None
+        self.active[slot] = False
+        self.ring.clear(slot)
+        self._free_slots.append(slot)
+
+    def push(self, session_id, samples):
+        """
+        Buffer PCM samples (k,) for one session; int16 input is scaled to [-1, 1].
+        Frames are analysed by process(). If the session's buffer fills up first,
+        process() runs early and the events it produced are returned here.
+        """
+        slot = self.slots[session_id]
+        samples = np.asarray(samples)
+        if samples.ndim != 1:
+            raise ValueError(f"Expected a 1-D sample array for one session, got shape {samples.shape}")
+        if samples.dtype == np.int16:
+            samples = samples.astype(np.float32) / 32768.0
+
+        events = []
+        while len(samples):
+            k = min(self.ring.free(slot), len(samples))
+            if not k:
+                events.extend(self.process())
+                continue
+            self.ring.write(slot, samples[:k])
+            samples = samples[k:]
+        return events
+
+    def process(self):
+        """
+        Analyse every complete buffered frame, one frame per ready session per
+        vectorised step. Returns the events, in time order within each session.
+        """
+        events = []
+        while True:
+            ready = np.flatnonzero(self.active & (self.ring.size >= self.frame_len))
+            if not ready.size:
+                return events
+            energy_db, zcr = frame_features(self.ring.read(ready, self.frame_len))
+            events.extend(self._step(ready, energy_db, zcr))
+
+    def _step(self, slots, energy_db, zcr):
+        frames_seen = self.frames_seen[slots] + 1
+        self.frames_seen[slots] = frames_seen
+        time_ms = frames_seen * self.frame_ms
+        calibration_seen = self.calibration_seen[slots] + 1
+        self.calibration_seen[slots] = calibration_seen
+
+        # Cap the seed so a candidate speaking from the first frame is not taken for noise
+        noise_floor = self.noise_floor[slots]
+        noise_floor = np.where(calibration_seen == 1,
+                               np.minimum(energy_db, self.min_energy_db + self.energy_margin_db),
+                               noise_floor)
+        noise_floor = np.where(calibration_seen <= self.calibration_frames,
+                               np.minimum(noise_floor, energy_db), noise_floor)
+        threshold = np.maximum(self.min_energy_db, noise_floor + self.energy_margin_db)
+        # Loud frames count as speech regardless of ZCR so fricatives are not dropped
+        voiced = (energy_db > threshold) & ((zcr <= self.max_zcr) | (energy_db > threshold + self.energy_margin_db))
+
+        # Track unvoiced frames quickly. Voiced frames only lift the floor while they are
+        # more than two margins above it: that absorbs noise which switched on loud, but
+        # stops short of the level where sustained speech would start counting as silence.
+        risen = np.minimum(noise_floor + self.noise_rise * (energy_db - noise_floor),
+                           energy_db - 2 * self.energy_margin_db)
+        self.noise_floor[slots] = np.where(voiced, np.maximum(noise_floor, risen),
+                                           noise_floor + self.noise_adapt * (energy_db - noise_floor))
+        speech_run = np.where(voiced, self.speech_run[slots] + 1, 0)
+        self.speech_run[slots] = speech_run
+
+        events = []
+        in_speech = self.in_speech[slots]
+        onset = ~in_speech & (speech_run >= self.min_speech_frames)
+        for i in np.flatnonzero(onset):
+            events.append({
+                "session": self.slot_ids[slots[i]],
+                "event": "turn_start",
+                "time_ms": int(time_ms[i] - speech_run[i] * self.frame_ms),
+            })
+        in_speech |= onset
+        silence_level = np.where(onset, 0, self.silence_level[slots])
+        silence_frames = np.where((voiced & in_speech) | onset, 0, self.silence_frames[slots] + 1)
+
+        ended = in_speech & (silence_frames >= self.turn_end_frames)
+        for i in np.flatnonzero(ended):
+            events.append({
+                "session": self.slot_ids[slots[i]],
+                "event": "turn_end",
+                "time_ms": int(time_ms[i] - silence_frames[i] * self.frame_ms),
+            })
+        in_speech &= ~ended
+
+        silence_ms = silence_frames * self.frame_ms
+        for level, (name, threshold_ms) in enumerate(SILENCE_LEVELS):
+            crossed = ~in_speech & (silence_level == level) & (silence_ms >= threshold_ms)
+            for i in np.flatnonzero(crossed):
+                events.append({
+                    "session": self.slot_ids[slots[i]],
+                    "event": name,
+                    "time_ms": int(time_ms[i]),
+                    "silence_ms": int(silence_ms[i]),
+                })
+            silence_level[crossed] += 1
+
+        self.in_speech[slots] = in_speech
+        self.silence_frames[slots] = silence_frames
+        self.silence_level[slots] = silence_level
+        return events
+
+    def reset(self, session_id):
+        """
+        Restart silence timing and noise calibration for a session, e.g. when a new
+        question is asked or the audio source changes. The session clock keeps running.
+        """
+        slot = self.slots[session_id]
+        self.calibration_seen[slot] = 0
+        self.noise_floor[slot] = self.min_energy_db - self.energy_margin_db
+        self.in_speech[slot] = False
+        self.speech_run[slot] = 0
+        self.silence_frames[slot] = 0
+        self.silence_level[slot] = 0
+
+
+def speech_pattern(n_sessions, n_frames, rng):
+    """Voiced-frame mask of speech-like bursts separated by silences of varying length"""
+    voiced = np.zeros((n_sessions, n_frames), dtype=bool)
+    for session in range(n_sessions):
+        position = int(rng.integers(0, 50))
+        while position < n_frames:
+            burst = int(rng.integers(25, 250))
+            voiced[session, position:position + burst] = True
+            position += burst + int(rng.choice([20, 60, 300, 900]))
+    return voiced
+
+
+def synthetic_frame(voiced, frame_len, rng, sample_rate=16000):
+    """One int16 frame per entry of `voiced`: a voiced tone over background noise, or noise alone"""
+    t = np.arange(frame_len) / sample_rate
+    tone = np.sin(2 * np.pi * 180.0 * t).astype(np.float32)
+    noise = rng.standard_normal((voiced.shape[0], frame_len), dtype=np.float32)
+    audio = noise * 0.002 + voiced[:, np.newaxis] * (0.3 * tone + 0.05 * noise)
+    return (audio * 32767).astype(np.int16)
+
+
+def benchmark(n_sessions=1000, seconds=30, frame_ms=20, max_join_s=2.0, pool_frames=64):
+    """
+    Simulate n_sessions live streams: sessions join at staggered times, deliver
+    jittered chunks of 0-2 frames' worth of samples per tick (catching up when
+    they fall 3 frames behind) and leave when their audio ends. Reports the
+    time to push every chunk and process the ready frames on each 20 ms tick.
+    """
+    rng = np.random.default_rng(0)
+    detector = SilenceDetector(frame_ms=frame_ms)
+    frame_len = detector.frame_len
+    n_frames = seconds * 1000 // frame_ms
+    voiced = speech_pattern(n_sessions, n_frames, rng)
+    join_tick = rng.integers(0, int(max_join_s * 1000 // frame_ms) + 1, n_sessions)
+    total = n_frames * frame_len
+    sent = np.zeros(n_sessions, dtype=np.int64)
+    # Frames are drawn from small pre-built pools so audio generation stays out of the timing
+    pools = (synthetic_frame(np.zeros(pool_frames, dtype=bool), frame_len, rng),
+             synthetic_frame(np.ones(pool_frames, dtype=bool), frame_len, rng))
+
+    latencies = []
+    counts = {}
+    cpu_ms = 0.0
+    tick = 0
+    while np.any(sent < total):
+        due = np.clip((tick + 1 - join_tick) * frame_len, 0, total)
+        lag = due - sent
+        chunk = np.where(lag > 3 * frame_len, lag, np.minimum(lag, rng.integers(0, 2 * frame_len + 1, n_sessions)))
+        chunks = []
+        for session in np.flatnonzero((chunk > 0) | ((tick == join_tick) & (sent == 0))):
+            first, last = sent[session] // frame_len, (sent[session] + chunk[session] - 1) // frame_len + 1
+            index = np.arange(first, last)
+            frames = np.where(voiced[session, index][:, np.newaxis], pools[1][index % pool_frames],
+                              pools[0][index % pool_frames])
+            offset = sent[session] - first * frame_len
+            chunks.append((session, frames.ravel()[offset:offset + chunk[session]]))
+            sent[session] += chunk[session]
+
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        events = []
+        for session, samples in chunks:
+            if session not in detector.slots:
+                detector.add_session(session)
+            events.extend(detector.push(session, samples))
+        events.extend(detector.process())
+        for session, _ in chunks:
+            if sent[session] == total:
+                detector.remove_session(session)
+        latencies.append((time.perf_counter() - start) * 1000)
+        cpu_ms += (time.process_time() - cpu_start) * 1000
+        for event in events:
+            counts[event["event"]] = counts.get(event["event"], 0) + 1
+        tick += 1
+
+    latencies = np.array(latencies)
+    audio_ms = n_frames * frame_ms
+    logger.info(f"Sessions: {n_sessions}, audio per session: {seconds} s, frame: {frame_ms} ms, "
+                f"joins staggered over {max_join_s:.1f} s, jittered chunks")
+    logger.info(f"Per-tick latency ms: mean {latencies.mean():.3f}, "
+                f"p99 {np.percentile(latencies, 99):.3f}, max {latencies.max():.3f}")
+    logger.info(f"CPU time {cpu_ms:.0f} ms for {len(latencies) * frame_ms} ms of wall-clock audio "
+                f"-> real-time factor {len(latencies) * frame_ms / cpu_ms:.1f}x across all sessions")
+    logger.info(f"Events: {counts}")
+    return latencies, cpu_ms, audio_ms
+
+
+def scripted_audio(segments, rng, sample_rate=16000):
+    """
+    Build float audio from (kind, seconds, level_db) segments. kind is "speech"
+    (a 180 Hz tone at level_db over -54 dBFS noise) or "noise" (white noise at level_db).
+    """
+    parts = []
+    for kind, seconds, level_db in segments:
+        n = int(seconds * sample_rate)
+        amplitude = 10 ** (level_db / 20)
+        if kind == "speech":
+            t = np.arange(n) / sample_rate
+            audio = amplitude * np.sqrt(2) * np.sin(2 * np.pi * 180.0 * t) + 0.002 * rng.standard_normal(n)
+        else:
+            audio = amplitude * rng.standard_normal(n)
+        parts.append(audio.astype(np.float32))
+    return np.concatenate(parts)
+
+
+# (name, segments, expected events). An expected time of None only checks that the event occurs.
+CHECK_CASES = [
+    ("clean speech / silence / speech",
+     [("speech", 2, -16), ("noise", 16, -54), ("speech", 1, -16), ("noise", 1.5, -54)],
+     [("turn_start", 0), ("turn_end", 2000), ("brief_pause", 3000), ("extended_silence", 7000),
+      ("prolonged_silence", 17000), ("turn_start", 18000), ("turn_end", 19000), ("brief_pause", 20000)]),
+    ("30 s of continuous speech at -20 dBFS", [("speech", 30, -20), ("noise", 2, -54)],
+     [("turn_start", 0), ("turn_end", 30000), ("brief_pause", 31000)]),
+    ("stationary noise at -40 dBFS", [("noise", 20, -40)],
+     [("brief_pause", 1000), ("extended_silence", 5000), ("prolonged_silence", 15000)]),
+    ("stationary noise at -34 dBFS", [("noise", 20, -34)],
+     [("brief_pause", 1000), ("extended_silence", 5000), ("prolonged_silence", 15000)]),
+    ("stationary noise at -25 dBFS", [("noise", 20, -25)],
+     [("brief_pause", 1000), ("extended_silence", 5000), ("prolonged_silence", 15000)]),
+    ("speech over -34 dBFS noise", [("noise", 3, -34), ("speech", 2, -16), ("noise", 6, -34)],
+     [("brief_pause", 1000), ("turn_start", 3000), ("turn_end", 5000), ("brief_pause", 6000),
+      ("extended_silence", 10000)]),
+]
+
+# Run and logged by check() but not part of pass/fail: see the module docstring.
+KNOWN_LIMITATIONS = [
+    ("noise source switching on mid-session", [("noise", 2, -54), ("noise", 25, -30)]),
+]
+
+# Every case runs on two sessions at once: one from the start pushing 777-sample
+# chunks and one joining 1.37 s later with 320-sample chunks, so events must be
+# timed on each session's own clock.
+CHECK_STREAMS = {"early": (0, 777), "late": (21920, 320)}
+
+
+def run_streams(segments, rng, tick=160):
+    """Feed scripted audio to the CHECK_STREAMS sessions on a shared clock; return events per session"""
+    detector = SilenceDetector()
+    audio = scripted_audio(segments, rng)
+    events = {name: [] for name in CHECK_STREAMS}
+    sent = dict.fromkeys(CHECK_STREAMS, 0)
+
+    def collect(batch):
+        for event in batch:
+            events[event["session"]].append((event["event"], event["time_ms"]))
+
+    clock = 0
+    while any(position < len(audio) for position in sent.values()):
+        clock += tick
+        for name, (join, chunk) in CHECK_STREAMS.items():
+            if clock <= join:
+                continue
+            if name not in detector.slots:
+                detector.add_session(name)
+            due = min(len(audio), clock - join)
+            if due - sent[name] >= chunk or (due == len(audio) and sent[name] < due):
+                collect(detector.push(name, audio[sent[name]:due]))
+                sent[name] = due
+        collect(detector.process())
+    return events
+
+
+def check(tolerance_ms=40):
+    """Push scripted speech/silence/noise sequences and compare the events to the expected ones"""
+    rng = np.random.default_rng(0)
+    failures = 0
+    for name, segments, expected in CHECK_CASES:
+        for session, actual in run_streams(segments, rng).items():
+            ok = len(actual) == len(expected) and all(
+                got_name == want_name and (want_time is None or abs(got_time - want_time) <= tolerance_ms)
+                for (got_name, got_time), (want_name, want_time) in zip(actual, expected)
+            )
+            if ok:
+                logger.info(f"PASS {name} [{session}]")
+            else:
+                failures += 1
+                logger.error(f"FAIL {name} [{session}]: expected {expected}, got {actual}")
+    for name, segments in KNOWN_LIMITATIONS:
+        for session, actual in run_streams(segments, rng).items():
+            logger.info(f"KNOWN LIMITATION {name} [{session}]: {actual}")
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark or check the streaming silence detector")
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--seconds", type=int, default=30)
+    parser.add_argument("--frame-ms", type=int, default=20)
+    parser.add_argument("--check", action="store_true", help="run the scripted detection checks instead")
+    args = parser.parse_args()
+    if args.check:
+        failures = check()
+        if failures:
+            raise SystemExit(f"{failures} detection check(s) failed")
+        raise SystemExit(0)
+    latencies, cpu_ms, audio_ms = benchmark(args.sessions, args.seconds, args.frame_ms)
+    if np.percentile(latencies, 99) >= args.frame_ms:
+        raise SystemExit(f"p99 tick latency exceeds the {args.frame_ms} ms frame budget")
@@ -0,0 +1,168 @@
+"""
+Streaming output writers and a tail reader.
+
+Transcript lines and candidate results are written as soon as each one is
+ready, so memory stays flat on large runs and downstream consumers can start
+on partial output:
+  LineWriter       appends and flushes one text line at a time; with
+                   atomic=True it writes to `<path>.tmp` and replaces the
+                   target only on a clean close (raw.txt)
+  JSONLWriter      appends one JSON object per line (PrelimsSubmission.jsonl,
+                   PrelimsSubmission.updates.jsonl)
+  JSONArrayWriter  builds a valid JSON array in a temp file and atomically
+                   replaces the target on close (PrelimsSubmission.json)
+  tail_lines / tail_jsonl  follow a growing file, yielding complete lines
+"""
+import argparse
+import json
+import os
+import time
+
+
+class LineWriter:
+    """
+    Append text lines to a file, flushing after each so readers see them
+    immediately. With atomic=True lines go to `<path>.tmp`, which replaces
+    `path` on a clean close, so an interrupted run leaves the old file intact.
+    """
+
+    def __init__(self, path, mode='w', atomic=False):
+        self.path = path
+        self.atomic = atomic
+        self.tmp_path = f"{path}.tmp"
+        self.count = 0
+        self._file = open(self.tmp_path if atomic else path, mode, encoding='utf-8')
+
+    def write(self, line):
+        self._file.write(line + '\n')
+        self._file.flush()
+        self.count += 1
+
+    def close(self):
+        if self.atomic:
+            os.fsync(self._file.fileno())
+        self._file.close()
+        if self.atomic:
+            os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        """Stop writing; an atomic writer keeps its temp file and leaves `path` untouched"""
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class JSONLWriter(LineWriter):
+    """Append one JSON object per line"""
+
+    def write(self, obj):
+        super().write(json.dumps(obj, ensure_ascii=False))
+
+
+class JSONArrayWriter:
+    """
+    Write a JSON array one element at a time to `<path>.tmp`. On a clean close
+    the array is terminated, synced and renamed over `path`, so `path` only
+    ever holds a complete, valid array. Output matches json.dump(..., indent=2).
+    """
+
+    def __init__(self, path, indent=2):
+        self.path = path
+        self.tmp_path = f"{path}.tmp"
+        self.indent = indent
+        self.count = 0
+        self._file = open(self.tmp_path, 'w', encoding='utf-8')
+        self._file.write('[')
+
+    def write(self, obj):
+        prefix = ' ' * self.indent
+        text = json.dumps(obj, indent=self.indent, ensure_ascii=False)
+        self._file.write((',\n' if self.count else '\n') + prefix + text.replace('\n', '\n' + prefix))
+        self._file.flush()
+        self.count += 1
+
+    def close(self):
+        self._file.write('\n]' if self.count else ']')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        """Stop writing and keep the temp file, leaving any previous `path` untouched"""
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def tail_lines(path, follow=True, poll_interval=0.5, idle_timeout=None):
+    """
+    Yield complete lines from `path`, then keep following appended lines.
+    Waits for the file to appear and restarts from the top when it is replaced
+    (new inode), truncated, or rewritten in place so the bytes just before the
+    read position changed. Stops after `idle_timeout` seconds without new data
+    (None follows forever).
+    """
+    position = 0
+    partial = b''
+    identity = None
+    seen = b''
+    last_data = time.monotonic()
+    while True:
+        try:
+            f = open(path, 'rb')
+        except FileNotFoundError:
+            f = None
+        if f is not None:
+            # Read bytes so a multi-byte character split across writes is not decoded early
+            with f:
+                stat = os.fstat(f.fileno())
+                f.seek(position - len(seen))
+                if ((stat.st_dev, stat.st_ino) != identity or stat.st_size < position
+                        or f.read(len(seen)) != seen):
+                    position, partial, seen = 0, b'', b''
+                    identity = (stat.st_dev, stat.st_ino)
+                f.seek(position)
+                chunk = f.read()
+                position = f.tell()
+                seen = (seen + chunk)[-64:]
+            if chunk:
+                last_data = time.monotonic()
+                lines = (partial + chunk).split(b'\n')
+                partial = lines.pop()
+                for line in lines:
+                    if line.strip():
+                        yield line.decode('utf-8')
+        if not follow or (idle_timeout is not None and time.monotonic() - last_data > idle_timeout):
+            return
+        time.sleep(poll_interval)
+
+
+def tail_jsonl(path, follow=True, poll_interval=0.5, idle_timeout=None):
+    """Yield parsed objects from a JSONL file as they are appended"""
+    for line in tail_lines(path, follow, poll_interval, idle_timeout):
+        yield json.loads(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Follow raw.txt or a JSONL results file as it is written")
+    parser.add_argument("path")
+    parser.add_argument("--no-follow", action="store_true")
+    parser.add_argument("--idle-timeout", type=float, default=None)
+    args = parser.parse_args()
+    for line in tail_lines(args.path, follow=not args.no_follow, idle_timeout=args.idle_timeout):
+        print(line, flush=True)
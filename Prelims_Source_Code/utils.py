@@ -1,5 +1,7 @@
+import os
 import re
 import logging
+from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
@@ -320,4 +322,10 @@ def convert_utterances_to_dict(utterances):
     """Convert AssemblyAI Utterance objects to dictionaries"""
     if not utterances:
         return None
-    return [utterance.__dict__ for utterance in utterances]
\ No newline at end of file
+    return [utterance.__dict__ for utterance in utterances]
+
+def transcript_log_filename(audio_file):
+    """Log path unique per audio file and microsecond so concurrent transcriptions never overwrite each other"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    audio_name = os.path.splitext(os.path.basename(audio_file))[0]
+    return f"../logs/transcript_{timestamp}_{audio_name}.json"
@@ -5,7 +5,7 @@ from datetime import datetime
 import logging
 from groq import Groq
 from dotenv import load_dotenv
-from utils import expand_contractions, convert_words_to_dict, convert_utterances_to_dict
+from utils import expand_contractions, convert_words_to_dict, convert_utterances_to_dict, transcript_log_filename
 
 load_dotenv()
 
@@ -56,7 +56,7 @@ def transcribe_audio(audio_file):
     # replacements_summary = expansion_result["replacements"]
     
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_filename = f"../logs/transcript_{timestamp}.json"
+    log_filename = transcript_log_filename(audio_file)
     
     transcript_dict = {
         "service": "groq_whisper",